@@ -307,16 +307,21 @@ class Analysis():
             else:
                 time_mult = 1
 
+            label_order = np.asarray(label_order, dtype=int)
+            proba_order = np.asarray(proba_order, dtype=int)
+
             # Get the time to discovery
-            for i_time, idx in enumerate(label_order[n:]):
-                # for all inclusions that were found/labeled
-                if labels[idx] == 1:
-                    time_results[idx].append(time_mult * (i_time + 1))
-            for i_time, idx in enumerate(proba_order):
-                # for all inclusions that weren't found/labeled
-                if labels[idx] == 1 and idx not in label_order[:n]:
-                    time_results[idx].append(time_mult *
-                                             (i_time + len(label_order) + 1))
+            # for all inclusions that were found/labeled
+            found_order = label_order[n:]
+            for i_time in np.flatnonzero(labels[found_order] == 1):
+                time_results[found_order[i_time]].append(
+                    time_mult * (i_time + 1))
+            # for all inclusions that weren't found/labeled
+            not_found = (labels[proba_order] == 1) & \
+                ~np.isin(proba_order, label_order[:n])
+            for i_time in np.flatnonzero(not_found):
+                time_results[proba_order[i_time]].append(
+                    time_mult * (i_time + len(label_order) + 1))
 
         results = {}
 
@@ -359,7 +364,7 @@ class Analysis():
         }
 
         n_train = 0
-        _, n_initial = _get_labeled_order(state)
+        n_initial = state.n_priors
         for query_i in range(n_queries):
             new_limits = _get_limits(self.states,
                                      query_i,
@@ -15,26 +15,23 @@
 import numpy as np
 
 
+def _get_label_idx_methods(state):
+    """Get the labeled indices and their methods of all queries at once."""
+    label_columns = state.get_label_columns()
+    return label_columns["label_idx"], label_columns["label_methods"]
+
+
 def _find_inclusions(state, labels, remove_initial=True):
     """Find the number of inclusions found at each step."""
-    inclusions = []
-    n_initial_inc = 0
-    cur_inclusions = 0
-    n_initial = 0
-    n_queries = state.n_queries()
-    for query_i in range(n_queries):
-        try:
-            label_methods = state.get("label_methods", query_i)
-            label_idx = state.get("label_idx", query_i)
-        except KeyError:
-            continue
-        for i in range(len(label_idx)):
-            if label_methods[i] == "initial" and remove_initial:
-                n_initial_inc += labels[label_idx[i]]
-                n_initial += 1
-            else:
-                cur_inclusions += labels[label_idx[i]]
-                inclusions.append(cur_inclusions)
+    label_idx, label_methods = _get_label_idx_methods(state)
+    labels_found = labels[label_idx]
+
+    initial = np.zeros(len(label_idx), dtype=bool)
+    if remove_initial:
+        initial = label_methods == "initial"
+    n_initial_inc = labels_found[initial].sum()
+    n_initial = int(initial.sum())
+    inclusions = np.cumsum(labels_found[~initial]).tolist()
 
     inclusions_after_init = sum(labels == 1)
     if remove_initial:
@@ -44,20 +41,8 @@ def _find_inclusions(state, labels, remove_initial=True):
 
 def _get_labeled_order(state):
     """Get the order in which papers were labeled."""
-    label_order = []
-    n_initial = 0
-    n_queries = state.n_queries()
-    for query_i in range(n_queries):
-        try:
-            label_methods = state.get("label_methods", query_i)
-        except KeyError:
-            continue
-        label_idx = state.get("label_idx", query_i)
-        for i in range(len(label_idx)):
-            if label_methods[i] == "initial":
-                n_initial += 1
-        label_order.extend(label_idx)
-    return label_order, n_initial
+    label_idx, _ = _get_label_idx_methods(state)
+    return label_idx.tolist(), state.n_priors
 
 
 def _get_last_proba_order(state):
@@ -97,14 +82,8 @@ def _n_false_neg(state, query_i, labels):
     proba_order = _get_proba_order(state, query_i)
     if proba_order is None:
         return None
-    res = np.zeros(len(proba_order))
-
-    n_one = 0
-    for i in range(len(res)):
-        if labels[proba_order[i]] == 1:
-            n_one += 1
-        res[i] = n_one
-    return np.array(list(reversed(res)))
+    n_one = np.cumsum(labels[proba_order] == 1, dtype=float)
+    return n_one[::-1].copy()
 
 
 def _get_limits(states, query_i, labels, proba_allow_miss=[]):
@@ -121,13 +100,9 @@ def _get_limits(states, query_i, labels, proba_allow_miss=[]):
         else:
             num_left += new_num_left
     num_left /= len(states)
-    limits = [len(num_left)] * len(proba_allow_miss)
-    allow_miss = {i: proba for i, proba in enumerate(proba_allow_miss)}
-    for i in range(len(num_left)):
-        for i_prob, prob in list(allow_miss.items()):
-            if num_left[i] < prob:
-                limits[i_prob] = i
-                del allow_miss[i_prob]
-        if len(allow_miss) == 0:
-            break
+    limits = []
+    for prob in proba_allow_miss:
+        # first number of papers for which the criterium is met
+        below = np.flatnonzero(num_left < prob)
+        limits.append(int(below[0]) if len(below) > 0 else len(num_left))
     return limits
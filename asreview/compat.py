@@ -13,31 +13,30 @@
 # limitations under the License.
 
 
+import numpy as np
+
+
 def convert_id_to_idx(data_obj, record_id):
     """Convert record_id to row number."""
 
-    inv_record_id = dict(zip(data_obj.df.index.tolist(), range(len(data_obj))))
+    # The index builds its hash table once and reuses it between calls.
+    result = data_obj.df.index.get_indexer(record_id)
 
-    result = []
-    for i in record_id:
-        try:
-            result.append(inv_record_id[i])
-        except KeyError:
-            raise KeyError(f"record_id {i} not found in data.")
+    missing = np.flatnonzero(result == -1)
+    if len(missing) > 0:
+        raise KeyError(
+            f"record_id {record_id[missing[0]]} not found in data.")
 
-    return result
+    return result.tolist()
 
 
 def convert_idx_to_id(data_obj, indices):
     """Convert row number to record_id."""
 
-    inv_idx = dict(zip(range(len(data_obj)), data_obj.df.index.tolist()))
+    indices = np.asarray(indices, dtype=int)
 
-    result = []
-    for i in indices:
-        try:
-            result.append(inv_idx[i])
-        except KeyError:
-            raise KeyError(f"index {i} not found in data.")
+    invalid = np.flatnonzero((indices < 0) | (indices >= len(data_obj)))
+    if len(invalid) > 0:
+        raise KeyError(f"index {indices[invalid[0]]} not found in data.")
 
-    return result
+    return data_obj.df.index.values[indices].tolist()
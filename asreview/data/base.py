@@ -252,18 +252,19 @@ class ASReviewData():
             index_list = i
 
         if not by_index:
-            records = [
-                PaperRecord(**self.df.loc[j, :],
-                            record_id=j,
-                            column_spec=self.column_spec) for j in index_list
-            ]
-        else:
-            records = [
-                PaperRecord(**self.df.iloc[j],
-                            column_spec=self.column_spec,
-                            record_id=self.df.index.values[j])
-                for j in index_list
-            ]
+            # look up the rows of all record_ids at once
+            record_ids = index_list
+            index_list = self.df.index.get_indexer(record_ids)
+            missing = np.flatnonzero(index_list == -1)
+            if len(missing) > 0:
+                raise KeyError(record_ids[missing[0]])
+
+        records = [
+            PaperRecord(**self.df.iloc[j],
+                        column_spec=self.column_spec,
+                        record_id=self.df.index.values[j])
+            for j in index_list
+        ]
 
         if is_iterable(i):
             return records
@@ -401,12 +402,12 @@ class ASReviewData():
         numpy.ndarray
             Array of indices that have the 'initial' property.
         """
-        query_src = state.startup_vals()["query_src"]
-        if "initial" not in query_src:
-            return np.array([], dtype=int)
+        label_columns = state.get_label_columns()
+        prior_idx = label_columns["label_idx"][
+            label_columns["label_methods"] == "initial"]
         if by_index:
-            return np.array(query_src["initial"], dtype=int)
-        return self.df.index.values[query_src["initial"]]
+            return prior_idx.astype(int)
+        return self.df.index.values[prior_idx]
 
     def to_file(self, fp, labels=None, ranking=None):
         """Export data object to file.
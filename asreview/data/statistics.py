@@ -44,8 +44,9 @@ def n_relevant(data):
     int:
         The statistic
     """
-    if data.labels is not None:
-        return len(np.where(data.labels == 1)[0])
+    labels = data.labels
+    if labels is not None:
+        return np.count_nonzero(labels == 1)
     return None
 
 
@@ -62,9 +63,10 @@ def n_irrelevant(data):
     int:
         The statistic
     """
-    if data.labels is None:
+    labels = data.labels
+    if labels is None:
         return None
-    return len(np.where(data.labels == 0)[0])
+    return np.count_nonzero(labels == 0)
 
 
 def n_unlabeled(data):
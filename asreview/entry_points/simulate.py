@@ -187,6 +187,15 @@ def _simulate_parser(prog="simulate", description=DESCRIPTION_SIMULATE):
              "the program stops after all documents are reviewed or is "
              "interrupted by the user."
     )
+    parser.add_argument(
+        "--feature_matrix_dtype",
+        type=str,
+        default=None,
+        choices=["float32", "bfloat16", "int8"],
+        help="Type to store the feature matrix with in the state file, "
+             "to reduce its size. By default, the values are stored as "
+             "they are."
+    )
     parser.add_argument(
         "--verbose", "-v",
         default=0,
@@ -12,28 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import importlib.util
 import logging
 
-try:
-    import tensorflow as tf
-    from tensorflow.keras import optimizers
-    from tensorflow.keras.layers import Dense
-    from tensorflow.keras.layers import Embedding
-    from tensorflow.keras.layers import LSTM
-    from tensorflow.keras.models import Sequential
-    from tensorflow.keras.wrappers.scikit_learn import KerasClassifier
-except ImportError:
-    TF_AVAILABLE = False
-else:
-    TF_AVAILABLE = True
-    try:
-        tf.logging.set_verbosity(tf.logging.ERROR)
-    except AttributeError:
-        logging.getLogger("tensorflow").setLevel(logging.ERROR)
-
 from asreview.models.classifiers.base import BaseTrainClassifier
 from asreview.utils import _set_class_weight
 
+# tensorflow is only imported when a model is trained
+TF_AVAILABLE = importlib.util.find_spec("tensorflow") is not None
+logging.getLogger("tensorflow").setLevel(logging.ERROR)
+
 
 def _check_tensorflow():
     if not TF_AVAILABLE:
@@ -122,6 +110,8 @@ class LSTMBaseClassifier(BaseTrainClassifier):
         # check is tensorflow is available
         _check_tensorflow()
 
+        from tensorflow.keras.wrappers.scikit_learn import KerasClassifier
+
         sequence_length = X.shape[1]
         if self._model is None or sequence_length != self.sequence_length:
             self.sequence_length = sequence_length
@@ -187,6 +177,11 @@ def _create_lstm_base_model(embedding_matrix,
     _check_tensorflow()
 
     def model_wrapper():
+        from tensorflow.keras.layers import Dense
+        from tensorflow.keras.layers import Embedding
+        from tensorflow.keras.layers import LSTM
+        from tensorflow.keras.models import Sequential
+
         model = Sequential()
 
         # add first embedding layer with pretrained wikipedia weights
@@ -235,6 +230,8 @@ def _create_lstm_base_model(embedding_matrix,
 
 def _get_optimizer(optimizer, lr_mult=1.0):
     "Get optimizer with correct learning rate."
+    from tensorflow.keras import optimizers
+
     if optimizer == "sgd":
         return optimizers.SGD(lr=0.01 * lr_mult)
     elif optimizer == "rmsprop":
@@ -12,31 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import importlib.util
 import logging
 
-try:
-    import tensorflow as tf
-    from tensorflow.keras.constraints import MaxNorm
-    from tensorflow.keras.layers import Dense
-    from tensorflow.keras.layers import Embedding
-    from tensorflow.keras.layers import Flatten
-    from tensorflow.keras.layers import LSTM
-    from tensorflow.keras.layers import MaxPooling1D
-    from tensorflow.keras.models import Sequential
-    from tensorflow.keras.wrappers.scikit_learn import KerasClassifier
-except ImportError:
-    TF_AVAILABLE = False
-else:
-    TF_AVAILABLE = True
-    try:
-        tf.logging.set_verbosity(tf.logging.ERROR)
-    except AttributeError:
-        logging.getLogger("tensorflow").setLevel(logging.ERROR)
-
 from asreview.models.classifiers.base import BaseTrainClassifier
 from asreview.models.classifiers.lstm_base import _get_optimizer
 from asreview.utils import _set_class_weight
 
+# tensorflow is only imported when a model is trained
+TF_AVAILABLE = importlib.util.find_spec("tensorflow") is not None
+logging.getLogger("tensorflow").setLevel(logging.ERROR)
+
 
 def _check_tensorflow():
     if not TF_AVAILABLE:
@@ -126,6 +112,8 @@ class LSTMPoolClassifier(BaseTrainClassifier):
         # check is tensorflow is available
         _check_tensorflow()
 
+        from tensorflow.keras.wrappers.scikit_learn import KerasClassifier
+
         sequence_length = X.shape[1]
         if self._model is None or sequence_length != self.sequence_length:
             self.sequence_length = sequence_length
@@ -191,6 +179,14 @@ def _create_lstm_pool_model(embedding_matrix,
     # The Sklearn API requires a callable as result.
     # https://keras.io/scikit-learn-api/
     def model_wrapper():
+        from tensorflow.keras.constraints import MaxNorm
+        from tensorflow.keras.layers import Dense
+        from tensorflow.keras.layers import Embedding
+        from tensorflow.keras.layers import Flatten
+        from tensorflow.keras.layers import LSTM
+        from tensorflow.keras.layers import MaxPooling1D
+        from tensorflow.keras.models import Sequential
+
         model = Sequential()
 
         # add first embedding layer with pretrained wikipedia weights
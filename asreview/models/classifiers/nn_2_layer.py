@@ -12,35 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import importlib.util
 import logging
 
-try:
-    import tensorflow as tf
-    from tensorflow.keras.layers import Dense
-    from tensorflow.keras.models import Sequential
-    from tensorflow.keras.wrappers.scikit_learn import KerasClassifier
-    from tensorflow.keras import regularizers
-    from tensorflow.keras.models import load_model
-    from tensorflow.keras.callbacks import EarlyStopping 
-
-except ImportError:
-    TF_AVAILABLE = False
-else:
-    TF_AVAILABLE = True
-    try:
-        tf.logging.set_verbosity(tf.logging.ERROR)
-    except AttributeError:
-        logging.getLogger("tensorflow").setLevel(logging.ERROR)
-
 import scipy
-from os.path import isfile
 import numpy as np
 
-
 from asreview.models.classifiers.base import BaseTrainClassifier
-from asreview.models.classifiers.lstm_base import _get_optimizer
 from asreview.utils import _set_class_weight
 
+# tensorflow is only imported when a model is trained
+TF_AVAILABLE = importlib.util.find_spec("tensorflow") is not None
+logging.getLogger("tensorflow").setLevel(logging.ERROR)
+
 
 def _check_tensorflow():
     if not TF_AVAILABLE:
@@ -49,6 +33,65 @@ def _check_tensorflow():
             " 'EmbeddingIdf'.")
 
 
+def _init_horovod():
+    """Import and initialize Horovod for distributed training.
+
+    On the first call, each process is pinned to a single GPU. This is
+    only possible if tensorflow has not yet initialized its runtime in
+    this process; otherwise the visible devices are left unchanged.
+
+    Returns
+    -------
+    module:
+        The initialized ``horovod.tensorflow.keras`` module.
+    """
+    import tensorflow as tf
+    try:
+        import horovod.tensorflow.keras as hvd
+    except ImportError:
+        raise ImportError(
+            "Install horovod package (`pip install horovod`) to use"
+            " distributed training.")
+
+    if not hvd.is_initialized():
+        hvd.init()
+        gpus = tf.config.list_physical_devices('GPU')
+        if gpus:
+            try:
+                tf.config.set_visible_devices(gpus[hvd.local_rank()], 'GPU')
+            except RuntimeError:
+                logging.warning(
+                    "Tensorflow was initialized before Horovod, not pinning "
+                    "the process to a single GPU.")
+    return hvd
+
+
+def _shard_indices(n_samples, rank, size):
+    """Get the rows of the training data for one process.
+
+    All processes get the same number of rows, such that they train the
+    same number of steps per epoch and none of them waits in the allreduce
+    of a step that the others do not take. To fill the shards, the first
+    rows are repeated if the number of rows is not a multiple of size.
+
+    Arguments
+    ---------
+    n_samples: int
+        Number of rows of the training data.
+    rank: int
+        Rank of the process.
+    size: int
+        Number of processes.
+
+    Returns
+    -------
+    numpy.ndarray:
+        Indices of the rows of the shard.
+    """
+    n_shard = -(-n_samples // size)
+    return np.arange(rank, n_shard * size, size) % n_samples
+
+
 class NN2LayerClassifier(BaseTrainClassifier):
     """Dense neural network classifier.
 
@@ -63,11 +106,6 @@ class NN2LayerClassifier(BaseTrainClassifier):
         tensorflow`` or install all optional ASReview dependencies with ``pip
         install asreview[all]``
 
-    .. warning::
-
-        Might crash on some systems with limited memory in
-        combination with :class:`asreview.models.feature_extraction.Tfidf`.
-
     Arguments
     ---------
     dense_width: int
@@ -82,12 +120,22 @@ class NN2LayerClassifier(BaseTrainClassifier):
         Verbosity of the model mirroring the values for Keras.
     epochs: int
         Number of epochs to train the neural network.
+    warm_start_epochs: int
+        Maximum number of epochs when continuing to train the network of
+        the previous query.
     batch_size: int
         Batch size used for the neural network.
     shuffle: bool
         Whether to shuffle the training data prior to training.
     class_weight: float
         Class weights for inclusions (1's).
+    precision: str
+        Keras mixed precision policy used during training. Options are
+        'float32', 'mixed_float16' and 'mixed_bfloat16'.
+    distributed: bool
+        Whether to train data parallel over multiple processes with
+        Horovod (launched with ``horovodrun``). Requires ``horovod`` to be
+        installed.
     """
 
     name = "nn-2-layer"
@@ -99,9 +147,12 @@ class NN2LayerClassifier(BaseTrainClassifier):
                  regularization=0.01,
                  verbose=0,
                  epochs=35,
+                 warm_start_epochs=10,
                  batch_size=32,
                  shuffle=False,
-                 class_weight=30.0):
+                 class_weight=30.0,
+                 precision='float32',
+                 distributed=False):
         """Initialize the 2-layer neural network model."""
         super(NN2LayerClassifier, self).__init__()
         self.dense_width = int(dense_width)
@@ -110,14 +161,20 @@ class NN2LayerClassifier(BaseTrainClassifier):
         self.regularization = regularization
         self.verbose = verbose
         self.epochs = int(epochs)
+        self.warm_start_epochs = int(warm_start_epochs)
         self.batch_size = int(batch_size)
         self.shuffle = shuffle
         self.class_weight = class_weight
-        self.delta=0.03
-        self.patience=2
+        self.precision = precision
+        self.distributed = distributed
+        # minimal relative improvement of the loss for early stopping
+        self.delta = 0.03
+        self.patience = 2
         self.iteration = 1
 
-        self._model = None
+        self._keras_model = None
+        self.earlystop = None
+        self._earlystop_scaler = None
         self.input_dim = None
 
     def fit(self, X, y):
@@ -125,34 +182,79 @@ class NN2LayerClassifier(BaseTrainClassifier):
         # check is tensorflow is available
         _check_tensorflow()
 
-        if scipy.sparse.issparse(X):
-            X = X.toarray()
-
-        self.input_dim = X.shape[1]
-        keras_model = _create_dense_nn_model(
-            self.input_dim, self.dense_width, self.optimizer,
-            self.learn_rate, self.regularization, self.verbose)
-        self._model = KerasClassifier(keras_model, verbose=self.verbose)
-        self.earlystop = EarlyStopping(monitor='loss', mode='min', min_delta = self.delta, patience = self.patience, restore_best_weights=True)
-
-        history = self._model.fit(
-            X,
-            y,
-            batch_size=self.batch_size,
-            epochs=self.epochs,
-            shuffle=self.shuffle,
-            verbose=self.verbose,
-            callbacks=[self.earlystop],
+        from tensorflow.keras.callbacks import EarlyStopping
+        from tensorflow.keras.callbacks import LambdaCallback
+
+        # initialize before any other use of tensorflow, to pin the GPU
+        if self.distributed:
+            hvd = _init_horovod()
+
+        # reuse the model (and its weights) of the previous query
+        input_dim = X.shape[1]
+        if self._keras_model is None or input_dim != self.input_dim:
+            self.input_dim = input_dim
+            keras_model = _create_dense_nn_model(
+                self.input_dim, self.dense_width, self.optimizer,
+                self.learn_rate, self.regularization, self.verbose,
+                self.precision, self.distributed)
+            self._keras_model = keras_model()
+            epochs = self.epochs
+        else:
+            epochs = min(self.epochs, self.warm_start_epochs)
+
+        if self.earlystop is None:
+            self.earlystop = EarlyStopping(
+                monitor='loss',
+                mode='min',
+                min_delta=self.delta,
+                patience=self.patience,
+                restore_best_weights=True)
+            self._earlystop_scaler = LambdaCallback(
+                on_epoch_end=self._scale_min_delta)
+
+        callbacks = [self._earlystop_scaler, self.earlystop]
+        verbose = self.verbose
+        if self.distributed:
+            # each process trains on its own shard of the training data
+            shard_idx = _shard_indices(len(y), hvd.rank(), hvd.size())
+            X = X[shard_idx]
+            y = y[shard_idx]
+
+            # start from the same weights and stop early at the same epoch
+            callbacks = [
+                hvd.callbacks.BroadcastGlobalVariablesCallback(0),
+                hvd.callbacks.MetricAverageCallback(),
+            ] + callbacks
+            if hvd.rank() != 0:
+                verbose = 0
+
+        history = self._keras_model.fit(
+            _create_dataset(X, y, self.batch_size, self.shuffle),
+            epochs=epochs,
+            steps_per_epoch=int(np.ceil(len(y) / self.batch_size)),
+            verbose=verbose,
+            callbacks=callbacks,
             class_weight=_set_class_weight(self.class_weight))
 
-        history.model.save("model.h5")
         print("Iteration: ", self.iteration, "Amount of epochs: ",len(history.history["loss"]))    
         self.iteration = self.iteration+1
 
+    def _scale_min_delta(self, epoch, logs):
+        """Make the minimal improvement relative to the first epoch loss.
+
+        The (class weighted) loss differs in scale between queries, such
+        that an absolute min_delta would rarely stop training early.
+        """
+        if epoch == 0:
+            # keras stores min_delta with the sign of the monitor direction
+            sign = -1 if self.earlystop.min_delta < 0 else 1
+            self.earlystop.min_delta = sign * self.delta * logs["loss"]
+
     def predict_proba(self, X):
-        if scipy.sparse.issparse(X):
-            X = X.toarray()
-        return super(NN2LayerClassifier, self).predict_proba(X)
+        proba = self._keras_model.predict(
+            _create_dataset(X, batch_size=self.batch_size),
+            verbose=0).ravel()
+        return np.column_stack([1 - proba, proba])
 
     def full_hyper_space(self):
         from hyperopt import hp
@@ -176,30 +278,116 @@ class NN2LayerClassifier(BaseTrainClassifier):
         return hyper_space, hyper_choices
 
 
+def _create_dataset(X, y=None, batch_size=32, shuffle=False):
+    """Create a prefetching input pipeline for the neural network.
+
+    Features and labels are cast to float32 once, so Keras does not cast
+    them on every batch. Sparse matrices are converted to dense arrays one
+    batch at a time, instead of the full (n_samples x n_features) matrix.
+    Batches are prefetched, such that they are prepared while the previous
+    batch is being trained on.
+
+    For training (y is given), the rows are repeated indefinitely, such
+    that every batch has batch_size rows. With the same batch shape for
+    every query, the compiled train step is reused instead of compiled
+    again. Train with steps_per_epoch=ceil(n_samples / batch_size).
+
+    Arguments
+    ---------
+    X: numpy.ndarray, scipy.sparse.spmatrix
+        Feature matrix.
+    y: numpy.ndarray
+        Labels, if None only the feature batches are yielded once.
+    batch_size: int
+        Number of rows in each batch.
+    shuffle: bool
+        Whether to shuffle the rows at the start of each pass over the data.
+
+    Returns
+    -------
+    tf.data.Dataset:
+        Dataset yielding dense float32 batches.
+    """
+    import tensorflow as tf
+
+    if y is not None:
+        y = np.asarray(y, dtype=np.float32)
+
+    if not scipy.sparse.issparse(X):
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if y is None:
+            dataset = tf.data.Dataset.from_tensor_slices(X)
+            dataset = dataset.batch(batch_size)
+        else:
+            dataset = tf.data.Dataset.from_tensor_slices((X, y))
+            if shuffle:
+                dataset = dataset.shuffle(len(y))
+            dataset = dataset.repeat().batch(batch_size, drop_remainder=True)
+        return dataset.prefetch(tf.data.AUTOTUNE)
+
+    X = scipy.sparse.csr_matrix(X)
+    n_samples, n_features = X.shape
+
+    def batch_generator():
+        for start in range(0, n_samples, batch_size):
+            yield X[start:start + batch_size].toarray().astype(np.float32)
+
+    def train_batch_generator():
+        def index_stream():
+            while True:
+                if shuffle:
+                    yield from np.random.permutation(n_samples)
+                else:
+                    yield from range(n_samples)
+
+        indices = index_stream()
+        while True:
+            batch_idx = np.fromiter(indices, dtype=int, count=batch_size)
+            yield X[batch_idx].toarray().astype(np.float32), y[batch_idx]
+
+    if y is None:
+        dataset = tf.data.Dataset.from_generator(
+            batch_generator,
+            output_signature=tf.TensorSpec(shape=(None, n_features),
+                                           dtype=tf.float32))
+    else:
+        dataset = tf.data.Dataset.from_generator(
+            train_batch_generator,
+            output_signature=(
+                tf.TensorSpec(shape=(batch_size, n_features),
+                              dtype=tf.float32),
+                tf.TensorSpec(shape=(batch_size, ), dtype=tf.float32)))
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+
 def _create_dense_nn_model(vector_size=40,
                            dense_width=128,
                            optimizer='rmsprop',
                            learn_rate_mult=1.0,
                            regularization=0.01,
-                           verbose=1):
-    """Return callable lstm model.
+                           verbose=1,
+                           precision='float32',
+                           distributed=False):
+    """Return callable dense neural network model.
 
     Returns
     -------
     callable:
-        A function that return the Keras Sklearn model when
+        A function that returns the compiled Keras model when
         called.
 
     """
 
-    # check is tensorflow is available
-    _check_tensorflow()
-
     def model_wrapper():
+        import tensorflow as tf
+        from tensorflow.keras.layers import Dense
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras import regularizers
+
+        from asreview.models.classifiers.lstm_base import _get_optimizer
 
-        if isfile('model.h5'):
-            model = load_model("model.h5")
-            return model
+        # set the precision per layer, not for the whole process
+        policy = tf.keras.mixed_precision.Policy(precision)
 
         model = Sequential()
 
@@ -207,30 +395,53 @@ def _create_dense_nn_model(vector_size=40,
             Dense(
                 dense_width,
                 input_dim=vector_size,
-                kernel_regularizer=regularizers.l2(regularization),
-                activity_regularizer=regularizers.l1(regularization),
+                kernel_regularizer=regularizers.l1_l2(l1=regularization,
+                                                      l2=regularization),
                 activation='relu',
+                dtype=policy,
             ))
 
         # add Dense layer with relu activation
         model.add(
             Dense(
                 dense_width,
-                kernel_regularizer=regularizers.l2(regularization),
-                activity_regularizer=regularizers.l1(regularization),
+                kernel_regularizer=regularizers.l1_l2(l1=regularization,
+                                                      l2=regularization),
                 activation='relu',
+                dtype=policy,
             ))
 
-        # add Dense layer
-        model.add(Dense(1, activation='sigmoid'))
-
-        optimizer_fn = _get_optimizer(optimizer, learn_rate_mult)
-
-        # Compile model
-        model.compile(
-            loss='binary_crossentropy',
-            optimizer=optimizer_fn,
-            metrics=['acc'])
+        # add Dense layer, kept in float32 for numerical stability
+        model.add(Dense(1, activation='sigmoid', dtype='float32'))
+
+        if distributed:
+            # scale the learning rate with the number of processes
+            hvd = _init_horovod()
+            optimizer_fn = hvd.DistributedOptimizer(
+                _get_optimizer(optimizer, learn_rate_mult * hvd.size()))
+        else:
+            optimizer_fn = _get_optimizer(optimizer, learn_rate_mult)
+
+        # scale the loss to avoid underflow of float16 gradients
+        if precision == 'mixed_float16':
+            optimizer_fn = tf.keras.mixed_precision.LossScaleOptimizer(
+                optimizer_fn)
+
+        # Compile model, with XLA fusing the dense layers where supported;
+        # the Horovod allreduce ops have no XLA kernels by default
+        compile_kwargs = {} if distributed else {'jit_compile': True}
+        try:
+            model.compile(
+                loss='binary_crossentropy',
+                optimizer=optimizer_fn,
+                metrics=['acc'],
+                **compile_kwargs)
+        except TypeError:
+            # jit_compile is not available for tensorflow < 2.5
+            model.compile(
+                loss='binary_crossentropy',
+                optimizer=optimizer_fn,
+                metrics=['acc'])
 
         if verbose >= 1:
             model.summary()
@@ -12,28 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import importlib.util
 import logging
 from math import log
 
 import numpy as np
 
-try:
-    import tensorflow as tf
-    from tensorflow.keras.preprocessing.text import text_to_word_sequence
-except ImportError:
-    TF_AVAILABLE = False
-else:
-    TF_AVAILABLE = True
-    try:
-        tf.logging.set_verbosity(tf.logging.ERROR)
-    except AttributeError:
-        logging.getLogger("tensorflow").setLevel(logging.ERROR)
-
-
 from asreview.models.feature_extraction.embedding_lstm import load_embedding
 from asreview.models.feature_extraction.base import BaseFeatureExtraction
 from asreview.utils import get_random_state
 
+# tensorflow is only imported when the features are extracted
+TF_AVAILABLE = importlib.util.find_spec("tensorflow") is not None
+logging.getLogger("tensorflow").setLevel(logging.ERROR)
+
 
 def _check_tensorflow():
     if not TF_AVAILABLE:
@@ -90,6 +82,8 @@ class EmbeddingIdf(BaseFeatureExtraction):
 
 
 def _get_freq_dict(all_text):
+    from tensorflow.keras.preprocessing.text import text_to_word_sequence
+
     text_dicts = []
     for text in all_text:
         cur_dict = {}
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import gzip
+import importlib.util
 import io
 import logging
 from multiprocessing import cpu_count
@@ -27,14 +28,8 @@ import numpy as np
 from asreview.utils import get_data_home
 from asreview.models.feature_extraction.base import BaseFeatureExtraction
 
-
-try:
-    from tensorflow.keras.preprocessing.text import Tokenizer
-    from tensorflow.keras.preprocessing.sequence import pad_sequences
-except ImportError:
-    TF_AVAILABLE = False
-else:
-    TF_AVAILABLE = True
+# tensorflow is only imported when the features are extracted
+TF_AVAILABLE = importlib.util.find_spec("tensorflow") is not None
 
 
 def _check_tensorflow():
@@ -189,6 +184,9 @@ def text_to_features(sequences,
         The array with features and the dictiory that maps words to values.
     """
 
+    from tensorflow.keras.preprocessing.text import Tokenizer
+    from tensorflow.keras.preprocessing.sequence import pad_sequences
+
     # fit on texts
     tokenizer = Tokenizer(num_words=num_words)
     tokenizer.fit_on_texts(sequences)
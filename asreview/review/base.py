@@ -104,6 +104,10 @@ class BaseReview(ABC):
         be already labeled. Failing to do so might result bad behaviour.
     state_file: str
         Path to state file. Replaces log_file argument.
+    feature_matrix_dtype: str
+        Type to store the feature matrix with in the state file:
+        'float32', 'bfloat16' or 'int8'. If None, store the values as they
+        are.
     """
 
     name = "base"
@@ -121,6 +125,7 @@ class BaseReview(ABC):
         start_idx=[],
         state_file=None,
         log_file=None,
+        feature_matrix_dtype=None,
     ):
         """Initialize base class for systematic reviews."""
         super(BaseReview, self).__init__()
@@ -204,7 +209,9 @@ class BaseReview(ABC):
                                                      as_data.headings,
                                                      as_data.bodies,
                                                      as_data.keywords)
-                state._add_as_data(as_data, feature_matrix=self.X)
+                state._add_as_data(as_data,
+                                   feature_matrix=self.X,
+                                   dtype=feature_matrix_dtype)
             if self.X.shape[0] != len(self.y):
                 raise ValueError("The state file does not correspond to the "
                                  "given data file, please use another state "
@@ -356,7 +363,7 @@ class BaseReview(ABC):
             pred_proba = self.model.predict_proba(self.X)
             self.shared['pred_proba'] = pred_proba
 
-        proba_1 = np.array([x[1] for x in pred_proba])
+        proba_1 = np.asarray(pred_proba)[:, 1]
         state.add_proba(pool_idx, self.train_idx, proba_1, self.query_i)
 
     def log_current_query(self, state):
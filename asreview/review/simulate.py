@@ -66,6 +66,10 @@ class ReviewSimulate(BaseReview):
         index, this option is ignored.
     state_file: str
         Path to state file. Replaces log_file argument.
+    feature_matrix_dtype: str
+        Type to store the feature matrix with in the state file:
+        'float32', 'bfloat16' or 'int8'. If None, store the values as they
+        are.
     """
 
     name = "simulate"
@@ -16,6 +16,11 @@ from abc import ABC, abstractmethod
 
 import numpy as np
 
+QUERY_DATASETS = [
+    "label_methods", "label_idx", "inclusions", "proba", "pool_idx",
+    "train_idx"
+]
+
 
 class BaseState(ABC):
     def __init__(self, state_fp, read_only=False):
@@ -28,6 +33,8 @@ class BaseState(ABC):
         """
         self.state_fp = state_fp
         self.read_only = read_only
+        self._cache = {}
+        self._last_proba_query = None
         self.restore(state_fp)
 
     def __enter__(self):
@@ -66,7 +73,7 @@ class BaseState(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def _add_as_data(self, as_data, feature_matrix=None):
+    def _add_as_data(self, as_data, feature_matrix=None, dtype=None):
         """Add properties from as_data to the state.
 
         Arguments
@@ -75,6 +82,11 @@ class BaseState(ABC):
             Data file from which the review is run.
         feature_matrix: np.ndarray, sklearn.sparse.csr_matrix
             Feature matrix computed by the feature extraction model.
+        dtype: str
+            Type to store the feature matrix values with, to reduce the
+            size of the state: 'float32', 'bfloat16' or 'int8'. If None,
+            store the values as they are. States without support for
+            quantization ignore this argument.
         """
         raise NotImplementedError
 
@@ -177,6 +189,100 @@ class BaseState(ABC):
         """
         raise NotImplementedError
 
+    def n_labeled(self, query_i=None):
+        """Number of records labeled in the state.
+
+        Only counts the records, without reading their indices where the
+        state supports it.
+
+        Arguments
+        ---------
+        query_i: int
+            Query number to count the labeled records of. If None, count
+            the labeled records of all queries.
+
+        Returns
+        -------
+        int
+            Number of labeled records.
+        """
+        if query_i is None:
+            queries = range(self.n_queries())
+        else:
+            queries = [query_i]
+
+        n_labeled = 0
+        for i in queries:
+            try:
+                label_idx = self.get("label_idx", i)
+            except (KeyError, IndexError):
+                continue
+            if label_idx is not None:
+                n_labeled += len(label_idx)
+        return n_labeled
+
+    @property
+    def n_priors(self):
+        """Number of records labeled as prior knowledge.
+
+        The number is cached until the state is modified.
+
+        Returns
+        -------
+        int
+            Number of records with the 'initial' label method.
+        """
+        if "n_priors" not in self._cache:
+            label_methods = self.get_label_columns()["label_methods"]
+            self._cache["n_priors"] = int(
+                np.count_nonzero(label_methods == "initial"))
+        return self._cache["n_priors"]
+
+    def get_label_columns(self):
+        """Get the labeled records of all queries at once.
+
+        The columns are cached until the state is modified. The arrays are
+        shared between calls and therefore read-only; copy them before
+        making changes.
+
+        Returns
+        -------
+        dict:
+            Dictionary with the label_idx, inclusions and label_methods of
+            all queries, in the order of labeling.
+        """
+        if "label_columns" in self._cache:
+            return self._cache["label_columns"]
+
+        columns = {"label_idx": [], "inclusions": [], "label_methods": []}
+        for query_i in range(self.n_queries()):
+            try:
+                query_columns = {
+                    name: self.get(name, query_i)
+                    for name in columns
+                }
+            except (KeyError, IndexError):
+                continue
+            for name, values in query_columns.items():
+                columns[name].append(values)
+
+        if len(columns["label_idx"]) > 0:
+            columns = {
+                name: np.concatenate(values)
+                for name, values in columns.items()
+            }
+            columns["label_idx"] = columns["label_idx"].astype(np.int64)
+        else:
+            columns = {
+                "label_idx": np.zeros(0, dtype=np.int64),
+                "inclusions": np.zeros(0, dtype=int),
+                "label_methods": np.zeros(0, dtype=str),
+            }
+        for values in columns.values():
+            values.setflags(write=False)
+        self._cache["label_columns"] = columns
+        return columns
+
     @abstractmethod
     def get(self, variable, query_i=None, default=None, idx=None):
         """Get data from the state object.
@@ -220,40 +326,31 @@ class BaseState(ABC):
         """
         labels = self.get("labels")
 
-        train_idx = []
-        query_src = {}
-        for query_i in range(self.n_queries()):
-            try:
-                label_idx = self.get("label_idx", query_i)
-                labelled = self.get("inclusions", query_i)
-                label_methods = self.get("label_methods", query_i)
-            except (KeyError, IndexError):
-                continue
-
-            for i, meth in enumerate(label_methods):
-                if meth not in query_src:
-                    query_src[meth] = []
-                query_src[meth].append(label_idx[i])
-                labels[label_idx[i]] = labelled[i]
-            train_idx.extend(label_idx)
+        label_columns = self.get_label_columns()
+        label_idx = label_columns["label_idx"]
+        label_methods = label_columns["label_methods"]
+        labels[label_idx] = label_columns["inclusions"]
+
+        # group the indices by method, in order of first occurrence
+        methods, method_first, method_inv = np.unique(
+            label_methods, return_index=True, return_inverse=True)
+        method_groups = np.split(
+            label_idx[np.argsort(method_inv, kind="stable")],
+            np.cumsum(np.bincount(method_inv, minlength=len(methods)))[:-1])
+        query_src = {
+            str(methods[i]): method_groups[i].tolist()
+            for i in np.argsort(method_first)
+        }
 
+        query_i = self.n_queries() - 1
         if query_i > 0:
-            n_queries = self.n_queries()
-            last_inclusions = None
-            try:
-                last_inclusions = self.get("inclusions", n_queries - 1)
-            except KeyError:
-                last_inclusions = []
-            if last_inclusions is None:
-                last_inclusions = []
-            query_i_classified = len(last_inclusions)
+            query_i_classified = self.n_labeled(query_i)
         else:
             query_i_classified = 0
 
-        train_idx = np.array(train_idx, dtype=np.int)
         startup_vals = {
             "labels": labels,
-            "train_idx": np.unique(train_idx),
+            "train_idx": np.unique(label_idx),
             "query_src": query_src,
             "query_i": query_i,
             "query_i_classified": query_i_classified,
@@ -268,15 +365,24 @@ class BaseState(ABC):
     @property
     def pred_proba(self):
         """Get last predicted probabilities."""
+        if self._last_proba_query is not None:
+            return self.get("proba", query_i=self._last_proba_query)
+
         for query_i in reversed(range(self.n_queries())):
             try:
                 proba = self.get("proba", query_i=query_i)
                 if proba is not None:
+                    self._last_proba_query = query_i
                     return proba
             except KeyError:
                 pass
         return None
 
+    def _update_last_proba_query(self, query_i):
+        """Register that probabilities were added to a query."""
+        if self._last_proba_query is None or query_i > self._last_proba_query:
+            self._last_proba_query = query_i
+
     @abstractmethod
     def initialize_structure(self):
         """Create empty internal structure for state"""
@@ -316,14 +422,29 @@ class BaseState(ABC):
         """
         raise NotImplementedError
 
+    def _clear_cache(self):
+        """Clear values derived from the state.
+
+        Should be called by every method that modifies the state.
+        """
+        self._cache = {}
+
     def to_dict(self):
         """Convert state to dictionary.
 
+        The dictionary is cached until the state is modified, so it should
+        not be changed by the caller.
+
         Returns
         -------
         dict:
             Dictionary with all relevant variables.
         """
+        if "to_dict" not in self._cache:
+            self._cache["to_dict"] = self._to_dict()
+        return self._cache["to_dict"]
+
+    def _to_dict(self):
         state_dict = {}
         state_dict["settings"] = vars(self.settings)
 
@@ -334,17 +455,36 @@ class BaseState(ABC):
             except KeyError:
                 pass
 
-        query_datasets = [
-            "label_methods", "label_idx", "inclusions", "proba", "pool_idx",
-            "train_idx"
-        ]
         state_dict["results"] = []
         for query_i in range(self.n_queries()):
-            state_dict["results"].append({})
-            for dataset in query_datasets:
-                try:
-                    state_dict["results"][query_i][dataset] = self.get(
-                        dataset, query_i).tolist()
-                except (KeyError, IndexError):
-                    pass
+            query_results = self._get_query_results(query_i)
+            state_dict["results"].append({
+                dataset: array.tolist()
+                for dataset, array in query_results.items()
+            })
         return state_dict
+
+    def _get_query_results(self, query_i):
+        """Get all datasets of a query at once.
+
+        States can override this to read a query in a single access,
+        instead of one call to get() per dataset.
+
+        Arguments
+        ---------
+        query_i: int
+            Query number, should be between 0 and self.n_queries().
+
+        Returns
+        -------
+        dict:
+            Dictionary with the datasets of the query. Datasets that are
+            not available for the query are left out.
+        """
+        query_results = {}
+        for dataset in QUERY_DATASETS:
+            try:
+                query_results[dataset] = self.get(dataset, query_i)
+            except (KeyError, IndexError):
+                pass
+        return query_results
@@ -92,8 +92,9 @@ class DictState(BaseState):
                 results[i][key].extend(new_dict[key])
             else:
                 results[i][key] = new_dict[key]
+        return i
 
-    def _add_as_data(self, as_data, feature_matrix=None):
+    def _add_as_data(self, as_data, feature_matrix=None, dtype=None):
         record_table = as_data.record_ids
         data_hash = as_data.hash()
 
@@ -143,9 +144,11 @@ class DictState(BaseState):
         return len(self._state_dict["results"]) == 0
 
     def set_labels(self, y):
+        self._clear_cache()
         self._state_dict["labels"] = y.tolist()
 
     def set_final_labels(self, y):
+        self._clear_cache()
         self._state_dict["final_labels"] = y.tolist()
 
     @property
@@ -157,9 +160,12 @@ class DictState(BaseState):
 
     @settings.setter
     def settings(self, settings):
+        self._clear_cache()
         self._state_dict["settings"] = vars(settings)
 
     def add_classification(self, idx, labels, methods, query_i):
+        self._clear_cache()
+
         # Ensure that variables are serializable
         idx = get_serial_list(idx, int)
         labels = get_serial_list(labels, int)
@@ -169,16 +175,27 @@ class DictState(BaseState):
         self._add_to_state(new_dict, query_i, append_result=True)
 
     def add_proba(self, pool_idx, train_idx, proba, query_i):
+        self._clear_cache()
         new_dict = {
             "pool_idx": get_serial_list(pool_idx, int),
             "train_idx": get_serial_list(train_idx, int),
             "proba": get_serial_list(proba, float),
         }
-        self._add_to_state(new_dict, query_i)
+        query_i = self._add_to_state(new_dict, query_i)
+        self._update_last_proba_query(query_i)
 
     def n_queries(self):
         return len(self._state_dict["results"])
 
+    def n_labeled(self, query_i=None):
+        results = self._state_dict["results"]
+        if query_i is not None:
+            try:
+                results = [results[query_i]]
+            except IndexError:
+                return 0
+        return sum(len(res.get("labelled", [])) for res in results)
+
     def get(self, variable, query_i=None, idx=None):
         if query_i is not None:
             res = self._state_dict["results"][query_i]
@@ -186,13 +203,13 @@ class DictState(BaseState):
         array = None
         label_vars = ["label_idx", "inclusions", "label_methods"]
         if variable in label_vars:
-            array_id = label_vars.index(variable)
+            # transpose the (idx, label, method) rows to columns at once
+            columns = list(zip(*res["labelled"])) or [[], [], []]
             if variable == "label_methods":
                 dtype = str
             else:
                 dtype = np.int
-            array = np.array([x[array_id] for x in res["labelled"]],
-                             dtype=dtype)
+            array = np.array(columns[label_vars.index(variable)], dtype=dtype)
         elif variable == "labels":
             array = np.array(self._state_dict["labels"], dtype=np.int)
         elif variable == "final_labels":
@@ -209,10 +226,30 @@ class DictState(BaseState):
             return array[idx]
         return array
 
+    def _get_query_results(self, query_i):
+        res = self._state_dict["results"][query_i]
+        query_results = {}
+        if "labelled" in res:
+            label_idx, inclusions, label_methods = (
+                zip(*res["labelled"]) if res["labelled"] else ([], [], []))
+            query_results["label_methods"] = np.array(label_methods,
+                                                      dtype=str)
+            query_results["label_idx"] = np.array(label_idx, dtype=int)
+            query_results["inclusions"] = np.array(inclusions, dtype=int)
+        if "proba" in res:
+            query_results["proba"] = np.array(res["proba"], dtype=float)
+        for dataset in ["pool_idx", "train_idx"]:
+            if dataset in res:
+                query_results[dataset] = np.array(res[dataset], dtype=int)
+        return query_results
+
     def delete_last_query(self):
+        self._clear_cache()
+        self._last_proba_query = None
         self._state_dict["results"].pop()
 
     def initialize_structure(self):
+        self._clear_cache()
         from asreview import __version__ as asr_version
         self._state_dict = OrderedDict({
             "time": {
@@ -24,16 +24,114 @@ from asreview.settings import ASReviewSettings
 from asreview.state.base import BaseState
 
 
-def _append_to_dataset(name, values, g, dtype):
-    if name not in g:
-        g.create_dataset(name, (len(values), ),
-                         dtype=dtype,
-                         maxshape=(None, ),
-                         chunks=True)
-    else:
-        g[name].resize((len(g[name]) + len(values), ))
-    dataset = g[name]
-    dataset[len(g[name]) - len(values):] = values
+def _append_to_datasets(g, columns):
+    """Append values to multiple datasets of the same length.
+
+    The new length is computed once, and datasets are only resized if
+    there are values to append.
+
+    Arguments
+    ---------
+    g: h5py.Group
+        Group that contains (or will contain) the datasets.
+    columns: dict
+        Dictionary with {name: (values, dtype)}; all values should have
+        the same length.
+    """
+    n_new = len(next(iter(columns.values()))[0])
+    n_cur = None
+    for name, (values, dtype) in columns.items():
+        if name not in g:
+            g.create_dataset(name, (0, ),
+                             dtype=dtype,
+                             maxshape=(None, ),
+                             chunks=True)
+        if n_cur is None:
+            n_cur = len(g[name])
+
+    # resizing changes the chunk index, skip it if nothing is appended
+    if n_new == 0:
+        return
+
+    for name, (values, dtype) in columns.items():
+        g[name].resize((n_cur + n_new, ))
+        g[name][n_cur:] = values
+
+
+def _quantize(values, dtype, columns, n_columns):
+    """Convert feature values to a compact type for storage.
+
+    HDF5 has no bfloat16 type, so bfloat16 values are stored as the upper
+    16 bits of their float32 representation (rounded to nearest even).
+    Int8 values are scaled per column by the largest absolute value.
+
+    Arguments
+    ---------
+    values: numpy.ndarray
+        Values of a dense feature matrix or the data of a csr_matrix.
+    dtype: str
+        Storage type: 'float32', 'bfloat16' or 'int8'.
+    columns: numpy.ndarray
+        Column index of every value of a csr_matrix, same shape as values.
+        None for a dense feature matrix.
+    n_columns: int
+        Number of columns of the feature matrix.
+
+    Returns
+    -------
+    numpy.ndarray, numpy.ndarray:
+        Stored values and the scale per column (None if not int8).
+    """
+    if dtype == "float32":
+        return values.astype(np.float32), None
+    if dtype == "bfloat16":
+        bits = values.astype(np.float32).view(np.uint32)
+        bits = bits + np.uint32(0x7FFF) + ((bits >> 16) & np.uint32(1))
+        return (bits >> 16).astype(np.uint16), None
+    if dtype == "int8":
+        if columns is None:
+            scale = np.abs(values).max(axis=0).astype(np.float32)
+        else:
+            scale = np.zeros(n_columns, dtype=np.float32)
+            np.maximum.at(scale, columns, np.abs(values))
+        scale[scale == 0] = 1
+        scale /= 127
+        scale_values = scale if columns is None else scale[columns]
+        return np.round(values / scale_values).astype(np.int8), scale
+    raise ValueError(f"Unknown feature matrix dtype '{dtype}'.")
+
+
+def _dequantize(stored, quantization, scale, columns):
+    """Convert stored feature values back to float32.
+
+    Arguments
+    ---------
+    stored: numpy.ndarray
+        Values as stored by _quantize.
+    quantization: str
+        Storage type: 'float32', 'bfloat16' or 'int8'.
+    scale: numpy.ndarray
+        Scale per column (only used for int8).
+    columns: numpy.ndarray
+        Column index of every value of a csr_matrix, same shape as stored.
+        None for a dense feature matrix.
+
+    Returns
+    -------
+    numpy.ndarray:
+        Feature values as float32.
+    """
+    if quantization == "bfloat16":
+        return (stored.astype(np.uint32) << 16).view(np.float32)
+    if quantization == "int8":
+        scale_values = scale if columns is None else scale[columns]
+        return stored.astype(np.float32) * scale_values
+    return stored.astype(np.float32)
+
+
+# The feature matrix is the largest part of the state, so store its
+# arrays chunked and compressed with the fast (h5py builtin) lzf filter.
+FEATURE_STORAGE = {"chunks": True, "compression": "lzf", "shuffle": True}
 
 
 def _result_group(f, query_i):
@@ -53,12 +151,14 @@ class HDF5State(BaseState):
         super(HDF5State, self).__init__(state_fp, read_only=read_only)
 
     def set_labels(self, y):
+        self._clear_cache()
         if "labels" not in self.f:
             self.f.create_dataset("labels", y.shape, dtype=np.int, data=y)
         else:
             self.f["labels"][...] = y
 
     def set_final_labels(self, y):
+        self._clear_cache()
         if "final_labels" not in self.f:
             self.f.create_dataset("final_labels",
                                   y.shape,
@@ -72,31 +172,40 @@ class HDF5State(BaseState):
             str(key): value
             for key, value in current_queries.items()
         }
-        data = np.string_(json.dumps(str_queries))
-        self.f.attrs.pop("current_queries", None)
-        self.f.attrs["current_queries"] = data
+        data = np.string_(json.dumps(str_queries, separators=(',', ':')))
+
+        # only write to the file if the queries changed; assigning an
+        # attribute replaces it, no need to delete it first
+        if self.f.attrs.get("current_queries", None) != data:
+            self.f.attrs["current_queries"] = data
+            self._modified = True
 
     def get_current_queries(self):
         str_queries = json.loads(self.f.attrs["current_queries"])
         return {int(key): value for key, value in str_queries.items()}
 
     def add_classification(self, idx, labels, methods, query_i):
+        self._clear_cache()
         g = _result_group(self.f, query_i)
         if "new_labels" not in g:
             g.create_group("new_labels")
 
         g = g['new_labels']
 
-        np_methods = np.array(list(map(np.string_, methods)))
-        _append_to_dataset('idx', idx, g, dtype=np.int)
-        _append_to_dataset('labels', labels, g, dtype=np.int)
-        _append_to_dataset('methods', np_methods, g, dtype='S20')
+        np_methods = np.asarray(methods, dtype='S20')
+        _append_to_datasets(g, {
+            'idx': (idx, int),
+            'labels': (labels, int),
+            'methods': (np_methods, 'S20'),
+        })
 
     def add_proba(self, pool_idx, train_idx, proba, query_i):
+        self._clear_cache()
         g = _result_group(self.f, query_i)
         g.create_dataset("pool_idx", data=pool_idx, dtype=np.int)
         g.create_dataset("train_idx", data=train_idx, dtype=np.int)
         g.create_dataset("proba", data=proba, dtype=np.float)
+        self._update_last_proba_query(query_i)
 
     @property
     def settings(self):
@@ -108,17 +217,27 @@ class HDF5State(BaseState):
 
     @settings.setter
     def settings(self, settings):
-        self.f.attrs.pop('settings', None)
+        self._clear_cache()
         self.f.attrs['settings'] = np.string_(json.dumps(vars(settings)))
 
     def n_queries(self):
         return len(self.f['results'].keys())
 
+    def n_labeled(self, query_i=None):
+        if query_i is None:
+            return sum(self.n_labeled(i) for i in self.f['results'])
+        label_idx = self.f.get(f"/results/{query_i}/new_labels/idx")
+        if label_idx is None:
+            return 0
+        return len(label_idx)
+
     def save(self):
-        self.f['end_time'] = str(datetime.now())
+        self.f.attrs['end_time'] = np.string_(datetime.now())
         self.f.flush()
+        self._modified = False
 
-    def _add_as_data(self, as_data, feature_matrix=None):
+    def _add_as_data(self, as_data, feature_matrix=None, dtype=None):
+        self._modified = True
         record_table = as_data.record_ids
         data_hash = as_data.hash()
         try:
@@ -139,68 +258,130 @@ class HDF5State(BaseState):
         if isinstance(feature_matrix, np.ndarray):
             if "feature_matrix" in as_data_group:
                 return
-            as_data_group.create_dataset("feature_matrix", data=feature_matrix)
+            values = feature_matrix
+            if dtype is not None:
+                values, scale = _quantize(values, dtype, None,
+                                          values.shape[1])
+            as_data_group.create_dataset("feature_matrix",
+                                         data=values,
+                                         **FEATURE_STORAGE)
             as_data_group.attrs['matrix_type'] = np.string_("ndarray")
         elif isinstance(feature_matrix, csr_matrix):
             if "indptr" in as_data_group:
                 return
-            as_data_group.create_dataset("indptr", data=feature_matrix.indptr)
+            values = feature_matrix.data
+            if dtype is not None:
+                values, scale = _quantize(values, dtype,
+                                          feature_matrix.indices,
+                                          feature_matrix.shape[1])
+            as_data_group.create_dataset("indptr",
+                                         data=feature_matrix.indptr,
+                                         **FEATURE_STORAGE)
             as_data_group.create_dataset("indices",
-                                         data=feature_matrix.indices)
+                                         data=feature_matrix.indices,
+                                         **FEATURE_STORAGE)
             as_data_group.create_dataset("shape",
                                          data=feature_matrix.shape,
                                          dtype=int)
-            as_data_group.create_dataset("data", data=feature_matrix.data)
+            as_data_group.create_dataset("data",
+                                         data=values,
+                                         **FEATURE_STORAGE)
             as_data_group.attrs["matrix_type"] = np.string_("csr_matrix")
         else:
             as_data_group.create_dataset("feature_matrix", data=feature_matrix)
             as_data_group.attrs["matrix_type"] = np.string_("unknown")
+            return
+
+        if dtype is not None:
+            as_data_group.attrs["quantization"] = np.string_(dtype)
+            if scale is not None:
+                as_data_group.create_dataset("feature_scale", data=scale)
 
     def get_feature_matrix(self, data_hash):
         as_data_group = self.f[f"/data_properties/{data_hash}"]
 
         matrix_type = as_data_group.attrs["matrix_type"].decode("ascii")
+        quantization = as_data_group.attrs.get("quantization", None)
+        if quantization is not None:
+            quantization = quantization.decode("ascii")
+            scale = as_data_group.get("feature_scale", None)
+            if scale is not None:
+                scale = scale[()]
+
         if matrix_type == "ndarray":
-            return np.array(as_data_group["feature_matrix"])
+            feature_matrix = np.array(as_data_group["feature_matrix"])
+            if quantization is not None:
+                feature_matrix = _dequantize(feature_matrix, quantization,
+                                             scale, None)
+            return feature_matrix
         elif matrix_type == "csr_matrix":
+            data = as_data_group["data"][()]
+            indices = as_data_group["indices"][()]
+            if quantization is not None:
+                data = _dequantize(data, quantization, scale, indices)
             feature_matrix = csr_matrix(
-                (as_data_group["data"], as_data_group["indices"],
-                 as_data_group["indexptr"]),
-                shape=as_data_group["shape"])
+                (data, indices, as_data_group["indptr"][()]),
+                shape=tuple(as_data_group["shape"][()]))
             return feature_matrix
         return as_data_group["feature_matrix"]
 
     def get(self, variable, query_i=None, idx=None):
         if query_i is not None:
             g = self.f[f"/results/{query_i}"]
-        array = None
+        dataset = None
         if variable == "label_methods":
-            array = np.array(g["new_labels"]["methods"]).astype('U20')
-        if variable == "label_idx":
-            array = np.array(g["new_labels"]["idx"], dtype=int)
-        if variable == "inclusions":
-            array = np.array(g["new_labels"]["labels"], dtype=int)
-        if variable == "proba":
-            array = np.array(g["proba"], dtype=np.float)
-        if variable == "labels":
-            array = np.array(self.f["labels"], dtype=np.int)
-        if variable == "final_labels":
-            array = np.array(self.f["final_labels"], dtype=np.int)
-        if variable == "pool_idx":
-            array = np.array(g["pool_idx"], dtype=np.int)
-        if variable == "train_idx":
-            array = np.array(g["train_idx"], dtype=np.int)
-        if array is None:
+            dataset = g["new_labels"]["methods"]
+        elif variable == "label_idx":
+            dataset = g["new_labels"]["idx"]
+        elif variable == "inclusions":
+            dataset = g["new_labels"]["labels"]
+        elif variable in ["proba", "pool_idx", "train_idx"]:
+            dataset = g[variable]
+        elif variable in ["labels", "final_labels"]:
+            dataset = self.f[variable]
+        if dataset is None:
             return None
+
+        array = dataset[()]
+        if variable == "label_methods":
+            array = array.astype('U20')
+        elif variable == "proba":
+            array = array.astype(float, copy=False)
+        else:
+            array = array.astype(int, copy=False)
+
         if idx is not None:
             return array[idx]
         return array
 
+    def _get_query_results(self, query_i):
+        g = self.f[f"/results/{query_i}"]
+        # list the datasets of the query once, instead of a lookup per name
+        members = set(g)
+        query_results = {}
+        if "new_labels" in members:
+            new_labels = g["new_labels"]
+            query_results["label_methods"] = np.array(
+                new_labels["methods"]).astype('U20')
+            query_results["label_idx"] = np.asarray(new_labels["idx"],
+                                                    dtype=int)
+            query_results["inclusions"] = np.asarray(new_labels["labels"],
+                                                     dtype=int)
+        if "proba" in members:
+            query_results["proba"] = np.asarray(g["proba"], dtype=float)
+        for dataset in ["pool_idx", "train_idx"]:
+            if dataset in members:
+                query_results[dataset] = np.asarray(g[dataset], dtype=int)
+        return query_results
+
     def delete_last_query(self):
+        self._clear_cache()
+        self._last_proba_query = None
         query_i_last = self.n_queries() - 1
         del self.f[f"/results/{query_i_last}"]
 
     def restore(self, fp):
+        self._clear_cache()
         if self.read_only:
             mode = 'r'
         else:
@@ -216,6 +397,7 @@ class HDF5State(BaseState):
                     f"state file version {state_version}.")
         except KeyError:
             self.initialize_structure()
+        self._modified = False
 
     def initialize_structure(self):
         self.f.attrs['start_time'] = np.string_(datetime.now())
@@ -225,6 +407,11 @@ class HDF5State(BaseState):
         self.f.create_group('results')
 
     def close(self):
-        if not self.read_only:
+        # only update the end time if the state changed since the last save
+        if not self.read_only and self._modified:
             self.f.attrs['end_time'] = np.string_(datetime.now())
         self.f.close()
+
+    def _clear_cache(self):
+        super(HDF5State, self)._clear_cache()
+        self._modified = True
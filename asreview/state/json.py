@@ -59,9 +59,14 @@ class JSONState(DictState):
             pass
 
     def restore(self, fp):
+        self._clear_cache()
         try:
-            with open(fp, "r") as f:
-                self._state_dict = OrderedDict(json.load(f))
+            if hasattr(fp, "read"):
+                # already opened, for example a member of a .asreview file
+                self._state_dict = OrderedDict(json.load(fp))
+            else:
+                with open(fp, "r") as f:
+                    self._state_dict = OrderedDict(json.load(f))
             state_version = self._state_dict["version"]
             if state_version != self.version:
                 raise ValueError(
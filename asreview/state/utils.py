@@ -17,7 +17,6 @@ import logging
 import os
 from pathlib import Path
 import zipfile
-import tempfile
 
 from asreview.config import STATE_EXTENSIONS
 
@@ -165,9 +164,11 @@ def state_from_asreview_file(data_fp):
 
     # Name of the state file in the .asreview file.
     state_fp_in_zip = 'result.json'
+
+    # Read the state file straight from the archive, without extracting
+    # it (or the data and other project files) to disk.
     with zipfile.ZipFile(data_fp, "r") as zipObj:
-        tmpdir = tempfile.TemporaryDirectory()
-        zipObj.extract(state_fp_in_zip, tmpdir.name)
-        fp = Path(tmpdir.name, state_fp_in_zip)
-        state = _get_state_class(fp)(state_fp=fp, read_only=True)
+        with zipObj.open(state_fp_in_zip) as fp:
+            state = _get_state_class(state_fp_in_zip)(state_fp=fp,
+                                                      read_only=True)
         return state
@@ -29,12 +29,16 @@ def _log_msg(msg, project_id=None):
 def get_db(db_file):
     db = sqlite3.connect(str(db_file), detect_types=sqlite3.PARSE_DECLTYPES)
     db.row_factory = sqlite3.Row
+    # The locks don't need to survive a system crash, so don't wait for
+    # the disk to sync on every acquire and release.
+    db.execute('PRAGMA synchronous=OFF')
     return db
 
 
 def release_all_locks(db_file):
     db = get_db(db_file)
     db.execute('DELETE FROM locks;')
+    db.commit()
     db.close()
 
 
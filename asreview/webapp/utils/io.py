@@ -146,15 +146,14 @@ def read_proba_legacy(project_id):
 
     with open(proba_fp, "r") as f:
 
-        # read the JSON file and make a list of the proba's
-        proba = json.load(f)
-        proba = [float(x) for x in proba]
+        # read the JSON file and make an array of the proba's
+        proba = np.array(json.load(f), dtype=float)
 
     # make a dataframe that looks like the new structure
     as_data = read_data(project_id)
     proba = pd.DataFrame(
         {
-            "proba": [float(x) for x in proba]
+            "proba": proba
         },
         index=as_data.record_ids
     )
@@ -166,7 +165,10 @@ def read_proba(project_id):
 
     proba_fp = get_proba_path(project_id)
     try:
-        return pd.read_csv(proba_fp, index_col="record_id")
+        # the column types are known, skip the type inference of pandas
+        return pd.read_csv(proba_fp,
+                           index_col="record_id",
+                           dtype={"proba": np.float64})
     except FileNotFoundError:
 
         # try to read the legacy file
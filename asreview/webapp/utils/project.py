@@ -235,13 +235,14 @@ def add_dataset_to_project(project_id, file_name):
         as_data = read_data(project_id)
 
         if as_data.labels is not None:
-            unlabeled = np.where(as_data.labels == LABEL_NA)[0]
-            pool_indices = as_data.record_ids[unlabeled]
+            labels = as_data.labels
+            record_ids = as_data.record_ids
+            unlabeled = labels == LABEL_NA
+            pool_indices = record_ids[unlabeled]
 
-            labeled_indices = np.where(as_data.labels != LABEL_NA)[0]
             label_indices = list(zip(
-                as_data.record_ids[labeled_indices].tolist(),
-                as_data.labels[labeled_indices].tolist()
+                record_ids[~unlabeled].tolist(),
+                labels[~unlabeled].tolist()
             ))
         else:
             pool_indices = as_data.record_ids
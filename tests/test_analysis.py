@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+
+from asreview.analysis import Analysis
+from asreview.analysis.statistics import _find_inclusions
+from asreview.analysis.statistics import _get_limits
+from asreview.state.utils import open_state
+
+LABELS = np.array([1, 0, 1, 1, 0, 0, 1, 0])
+PROBAS = [[.9, .5, .6, .8, .1, .2, .3, .4],
+          [.9, .2, .7, .9, .1, .3, .4, .1],
+          [.9, .1, .4, .9, .1, .2, .8, .3]]
+CLASSIFIED = [([0, 4], [1, 0], ["initial", "initial"]),
+              ([3], [1], ["max"]),
+              ([1], [0], ["max"])]
+
+
+def test_analysis(tmpdir):
+    for state_file in ['test.json', 'test.h5', None]:
+        check_analysis(tmpdir, state_file)
+
+
+def check_analysis(tmpdir, state_file):
+    if state_file is not None:
+        state_fp = os.path.join(tmpdir, state_file)
+    else:
+        state_fp = None
+
+    with open_state(state_fp) as state:
+        state.set_labels(LABELS)
+        train_idx = []
+        for query_i, (idx, labels, methods) in enumerate(CLASSIFIED):
+            state.add_classification(idx, labels, methods, query_i)
+            train_idx = sorted(train_idx + idx)
+            pool_idx = [i for i in range(len(LABELS)) if i not in train_idx]
+            state.add_proba(pool_idx, train_idx, np.array(PROBAS[query_i]),
+                            query_i)
+
+        assert _find_inclusions(state, LABELS) == ([1, 1], 3, 2)
+        assert _find_inclusions(state, LABELS, remove_initial=False) == \
+            ([1, 1, 2, 2], 4, 0)
+        assert _get_limits({0: state}, 1, LABELS, [0.1, 1.0, 2.0]) == \
+            [2, 2, 1]
+
+        analysis = Analysis([state])
+        assert analysis.avg_time_to_discovery() == {2: 6, 3: 1, 6: 5}
+        td_perc = analysis.avg_time_to_discovery(result_format="percentage")
+        assert td_perc.keys() == {2, 3, 6}
+        assert np.allclose([td_perc[i] for i in [2, 3, 6]],
+                           [100, 100 / 6, 500 / 6])
+
+        limits = analysis.limits(prob_allow_miss=[0.1, 1.0],
+                                 result_format="number")
+        assert np.all(limits["x_range"] == [0, 1, 2])
+        assert np.all(limits["limits"][0] == [3, 0, 0])
+        assert np.all(limits["limits"][1] == [3, 0, 0])
+        limits = analysis.limits(prob_allow_miss=0.1)
+        assert np.allclose(limits["x_range"], [0, 100 / 6, 200 / 6])
+        assert np.allclose(limits["limits"][0], [50, 0, 0])
@@ -0,0 +1,14 @@
+import numpy as np
+
+from asreview.models.classifiers.nn_2_layer import _shard_indices
+
+
+def test_shard_indices():
+    for n_samples in [1, 2, 3, 32, 65, 100]:
+        for size in [1, 2, 3, 4]:
+            shards = [_shard_indices(n_samples, rank, size)
+                      for rank in range(size)]
+            assert len(set(len(shard) for shard in shards)) == 1
+            assert len(shards[0]) == -(-n_samples // size)
+            assert np.all(np.unique(np.concatenate(shards)) ==
+                          np.arange(n_samples))
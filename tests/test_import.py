@@ -0,0 +1,9 @@
+import subprocess
+import sys
+
+
+def test_import_without_tensorflow():
+    # run in a new interpreter, other tests may have imported tensorflow
+    code = ("import sys; import asreview; import asreview.review; "
+            "assert 'tensorflow' not in sys.modules")
+    subprocess.run([sys.executable, "-c", code], check=True)
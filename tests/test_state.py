@@ -3,7 +3,9 @@ import shutil
 from pathlib import Path
 
 import numpy as np
+from scipy.sparse import csr_matrix
 
+from asreview import ASReviewData
 from asreview.state import JSONState, HDF5State, DictState
 from asreview.state import open_state, state_from_asreview_file
 from asreview.settings import ASReviewSettings
@@ -121,3 +123,62 @@ def check_state(state, label_i, query_i, labels, methods, proba):
         assert np.all(res["proba"] == proba)
         assert np.all(res["pool_idx"] == list(range(label_i + 1, n_records)))
         assert np.all(res["train_idx"] == list(range(0, label_i + 1)))
+        assert np.all(state.pred_proba == proba)
+
+
+def test_startup_vals(tmpdir):
+    for state_file in ['test.json', 'test.h5', None]:
+        check_startup_vals(tmpdir, state_file)
+
+
+def check_startup_vals(tmpdir, state_file):
+    if state_file is not None:
+        state_fp = os.path.join(tmpdir, state_file)
+    else:
+        state_fp = None
+
+    with open_state(state_fp) as state:
+        state.set_labels(np.full(6, -1, dtype=int))
+        state.add_classification([0, 4], [1, 0], ["initial", "initial"], 0)
+        state.add_classification([3], [1], ["random"], 1)
+        state.add_classification([1, 2], [0, 1], ["max", "random"], 2)
+        startup = state.startup_vals()
+        assert state.n_labeled() == 5
+        assert state.n_labeled(1) == 1
+        assert state.n_priors == 2
+        label_columns = state.get_label_columns()
+        assert np.all(label_columns["label_idx"] == [0, 4, 3, 1, 2])
+        assert not label_columns["label_idx"].flags.writeable
+
+    assert np.all(startup["labels"] == [1, 0, 1, 1, 0, -1])
+    assert np.all(startup["train_idx"] == [0, 1, 2, 3, 4])
+    assert list(startup["query_src"]) == ["initial", "random", "max"]
+    assert startup["query_src"]["initial"] == [0, 4]
+    assert startup["query_src"]["random"] == [3, 2]
+    assert startup["query_src"]["max"] == [1]
+    assert startup["query_i"] == 2
+    assert startup["query_i_classified"] == 2
+
+
+def test_quantized_feature_matrix(tmpdir):
+    as_data = ASReviewData.from_file(Path("tests", "demo_data", "generic.csv"))
+    rng = np.random.RandomState(535)
+    X_dense = rng.normal(size=(len(as_data), 10))
+    X_sparse = csr_matrix(np.where(X_dense > 0.5, X_dense, 0))
+
+    for X in [X_dense, X_sparse]:
+        for dtype, rtol in [(None, 0), ("float32", 1e-6),
+                            ("bfloat16", 1e-2), ("int8", 2e-2)]:
+            state_fp = os.path.join(tmpdir, f"quantized_{dtype}.h5")
+            with open_state(state_fp) as state:
+                state._add_as_data(as_data, feature_matrix=X, dtype=dtype)
+            with open_state(state_fp) as state:
+                X_stored = state.get_feature_matrix(as_data.hash())
+            os.remove(state_fp)
+
+            assert type(X_stored) is type(X)
+            X_arr, X_stored_arr = X, X_stored
+            if isinstance(X, csr_matrix):
+                X_arr, X_stored_arr = X.toarray(), X_stored.toarray()
+            atol = rtol * np.abs(X_arr).max(axis=0)
+            assert np.all(np.abs(X_stored_arr - X_arr) <= atol)